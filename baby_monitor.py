@@ -6,11 +6,17 @@ Detects when a baby rubs their eyes and alerts caregivers
 
 import cv2
 import mediapipe as mp
+from mediapipe.framework.formats import landmark_pb2
 import numpy as np
 import json
+import math
 import time
 import argparse
-from datetime import datetime
+import queue
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
 import sys
 
 try:
@@ -20,9 +26,267 @@ except ImportError:
     PYGAME_AVAILABLE = False
     print("Warning: pygame not available. Sound alerts will be disabled.")
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when numba is not installed"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+# Face mesh landmark indices for the approximate center region of each eye
+LEFT_EYE_IDX = (33, 133, 160, 159, 158, 157, 173)
+RIGHT_EYE_IDX = (362, 263, 387, 386, 385, 384, 398)
+
+# Hand landmark used as the rubbing point, resolved once at import to a plain int (8)
+INDEX_FINGER_TIP = int(mp.solutions.hands.HandLandmark.INDEX_FINGER_TIP)
+
+# Both eyes' indices (left eye first) for gathering landmarks in one pass
+_EYE_IDX = LEFT_EYE_IDX + RIGHT_EYE_IDX
+_EYE_IDX_ARR = np.array(_EYE_IDX, dtype=np.intp)
+
+# Outer corner and upper lid of each eye, sampled to tell whether the face moved
+# (or an eye closed) since the last frame
+_FACE_KEY_IDX = (33, 159, 263, 386)
+
+# Projects squared [dx, dy, dz] offsets onto [dx^2 + dy^2, dz^2], so the distance
+# and depth gates become one comparison against a (2,) threshold vector
+_GATE_PROJ = np.array([[1.0, 0.0],
+                       [1.0, 0.0],
+                       [0.0, 1.0]], dtype=np.float32)
+
+
+def _lm_to_np(landmark_list, indices):
+    """Decode the given landmarks into an (n, 3) float32 array in one pass
+    
+    Only the requested landmarks are read, which is much cheaper than
+    converting all 478 face mesh points when just the eyes are needed.
+    """
+    landmark = landmark_list.landmark
+    return np.fromiter(
+        (v for i in indices for lm in (landmark[i],) for v in (lm.x, lm.y, lm.z)),
+        dtype=np.float32, count=3 * len(indices)
+    ).reshape(-1, 3)
+
+
+class LandmarkArray:
+    """Landmarks held as an (n, 3) float32 array of normalized [x, y, z]
+    
+    Accepted in place of MediaPipe face landmarks (the GPU path produces these):
+    the eye points are then gathered with one fancy-indexed read of .xyz instead
+    of per-landmark attribute access. Hand landmarks must stay landmark lists.
+    """
+    
+    __slots__ = ('xyz',)
+    
+    def __init__(self, xyz):
+        self.xyz = np.asarray(xyz, dtype=np.float32)
+    
+    @classmethod
+    def from_landmarks(cls, landmarks):
+        """Convert all points of a MediaPipe landmark list into a LandmarkArray
+        
+        Args:
+            landmarks: A landmark list with a ``.landmark`` field, or a plain
+                sequence of points with x, y, z (as in a Tasks result)
+        """
+        landmarks = getattr(landmarks, 'landmark', landmarks)
+        return cls(np.fromiter(
+            (v for lm in landmarks for v in (lm.x, lm.y, lm.z)),
+            dtype=np.float32, count=3 * len(landmarks)
+        ).reshape(-1, 3))
+
+
+@njit(cache=True, fastmath=True)
+def _mean_motion(hist, head, count):
+    """Average distance between consecutive positions in a ring buffer
+    
+    Args:
+        hist: (N, 2) float32 ring buffer of positions
+        head: Index of the slot that will be written next
+        count: Number of valid positions in the buffer
+        
+    Returns:
+        float: Mean motion magnitude, or 0.0 with fewer than 2 positions
+    """
+    if count < 2:
+        return 0.0
+    
+    capacity = hist.shape[0]
+    start = (head - count + capacity) % capacity
+    total = 0.0
+    for i in range(1, count):
+        prev_idx = (start + i - 1) % capacity
+        curr_idx = (start + i) % capacity
+        dx = hist[curr_idx, 0] - hist[prev_idx, 0]
+        dy = hist[curr_idx, 1] - hist[prev_idx, 1]
+        total += math.hypot(dx, dy)
+    
+    return total / (count - 1)
+
+
+@njit(cache=True)
+def _ring_push(hist, head, count, x, y):
+    """Write a position into a ring buffer, overwriting the oldest entry when full
+    
+    Args:
+        hist: (N, 2) float32 ring buffer of positions, updated in place
+        head: Index of the slot that will be written next
+        count: Number of valid positions in the buffer
+        x, y: Position to record
+        
+    Returns:
+        tuple: Updated (head, count)
+    """
+    capacity = hist.shape[0]
+    hist[head, 0] = x
+    hist[head, 1] = y
+    return (head + 1) % capacity, min(count + 1, capacity)
+
+
+@njit(cache=True)
+def _motion_sequence(hist, head, count, points, near, out):
+    """Feed a sequence of fingertip positions through the ring buffer in one call
+    
+    Mirrors detect_eye_rubbing frame by frame: a frame away from the eyes clears
+    the history, a frame near them is pushed and gets the resulting mean motion.
+    
+    Args:
+        hist: (N, 2) float32 ring buffer of positions, updated in place
+        head: Index of the slot that will be written next
+        count: Number of valid positions in the buffer
+        points: (F, 2+) pixel positions, oldest first
+        near: (F,) bool, whether each frame passed the proximity check
+        out: (F,) float array receiving the motion per frame (0.0 when not near)
+        
+    Returns:
+        tuple: Updated (head, count)
+    """
+    for f in range(points.shape[0]):
+        if not near[f]:
+            count = 0
+            out[f] = 0.0
+            continue
+        head, count = _ring_push(hist, head, count, points[f, 0], points[f, 1])
+        out[f] = _mean_motion(hist, head, count)
+    return head, count
+
+
+@njit(cache=True)
+def _rub_step(eye_points, eye_scale, tip, gate_thresh, hist, head, count):
+    """One detect_eye_rubbing frame (eye centres, gates, history, motion) in one call
+    
+    Args:
+        eye_points: (2, 7, 3) float32 eye landmarks from BabyMonitor._eye_points()
+        eye_scale: (3,) factors turning a per-eye landmark sum into [x_px, y_px, depth]
+        tip: (3,) fingertip [x_px, y_px, depth]
+        gate_thresh: (2,) [distance^2, depth^2] limits, compared with <=
+        hist: (N, 2) float32 ring buffer of positions, updated in place
+        head: Index of the slot that will be written next
+        count: Number of valid positions in the buffer
+        
+    Returns:
+        tuple: (near, motion, head, count); when not near the history is cleared
+    """
+    near = False
+    for e in range(eye_points.shape[0]):
+        sx = np.float32(0.0)
+        sy = np.float32(0.0)
+        sz = np.float32(0.0)
+        for k in range(eye_points.shape[1]):
+            sx += eye_points[e, k, 0]
+            sy += eye_points[e, k, 1]
+            sz += eye_points[e, k, 2]
+        dx = sx * eye_scale[0] - tip[0]
+        dy = sy * eye_scale[1] - tip[1]
+        dz = sz * eye_scale[2] - tip[2]
+        if dx * dx + dy * dy <= gate_thresh[0] and dz * dz <= gate_thresh[1]:
+            near = True
+    
+    if not near:
+        return False, 0.0, head, 0
+    
+    head, count = _ring_push(hist, head, count, tip[0], tip[1])
+    return True, _mean_motion(hist, head, count), head, count
+
+
+class _DetectionState:
+    """Mutable detection state for one video stream, grouped in a slotted object
+    
+    Attributes:
+        hist: (N, 2) float32 ring buffer of hand positions
+        head: Index of the slot that will be written next
+        count: Number of valid positions in the buffer
+        consecutive: Consecutive frames in which rubbing was detected
+    """
+    
+    __slots__ = ('hist', 'head', 'count', 'consecutive')
+    
+    def __init__(self, history_frames):
+        self.hist = np.zeros((history_frames, 2), dtype=np.float32)
+        self.head = 0
+        self.count = 0
+        self.consecutive = 0
+
+
+class _TasksLandmarker:
+    """Adapts a MediaPipe Tasks landmarker to the solutions-style process() API
+    
+    Results expose ``multi_face_landmarks``/``multi_hand_landmarks`` as lists
+    built by ``convert``: hands need landmark_pb2 lists for drawing_utils, while
+    faces are only read for their eye points and use the cheaper LandmarkArray.
+    """
+    
+    def __init__(self, landmarker, result_field, output_field, convert):
+        self._landmarker = landmarker
+        self._result_field = result_field
+        self._output_field = output_field
+        self._convert = convert
+        self._start_time = time.monotonic()
+        self._last_timestamp_ms = -1
+    
+    def process(self, rgb_frame):
+        """Run the landmarker on an RGB frame"""
+        image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
+        
+        # VIDEO mode requires strictly increasing timestamps
+        timestamp_ms = int((time.monotonic() - self._start_time) * 1000)
+        timestamp_ms = max(timestamp_ms, self._last_timestamp_ms + 1)
+        self._last_timestamp_ms = timestamp_ms
+        
+        result = self._landmarker.detect_for_video(image, timestamp_ms)
+        
+        landmark_lists = [self._convert(landmarks)
+                          for landmarks in getattr(result, self._result_field)]
+        
+        return SimpleNamespace(**{self._output_field: landmark_lists or None})
+    
+    def close(self):
+        """Release the underlying landmarker"""
+        self._landmarker.close()
+
+
+def _to_landmark_pb2(landmarks):
+    """Copy Tasks landmarks into a landmark_pb2 list, as drawing_utils expects"""
+    landmark_list = landmark_pb2.NormalizedLandmarkList()
+    landmark_list.landmark.extend(
+        landmark_pb2.NormalizedLandmark(x=lm.x, y=lm.y, z=lm.z) for lm in landmarks
+    )
+    return landmark_list
+
 
 class BabyMonitor:
-    """Main class for baby monitoring with eye rubbing detection"""
+    """Main class for baby monitoring with eye rubbing detection
+    
+    A monitor is single-use: run() calls cleanup() when it returns, which
+    closes the MediaPipe graphs and worker threads. Create a new instance to
+    monitor again.
+    """
     
     def __init__(self, config_path='config.json'):
         """Initialize the baby monitor with configuration"""
@@ -33,28 +297,57 @@ class BabyMonitor:
         self.mp_hands = mp.solutions.hands
         self.mp_drawing = mp.solutions.drawing_utils
         
-        # Initialize face mesh and hand tracking
-        self.face_mesh = self.mp_face_mesh.FaceMesh(
-            max_num_faces=1,
-            refine_landmarks=True,
-            min_detection_confidence=self.config['detection']['min_detection_confidence'],
-            min_tracking_confidence=self.config['detection']['min_tracking_confidence']
-        )
+        # Initialize face mesh and hand tracking, on the GPU if requested
+        self.using_gpu = False
+        if self.config['detection'].get('use_gpu', False):
+            try:
+                self.face_mesh, self.hands = self._create_gpu_landmarkers()
+                self.using_gpu = True
+            except Exception as e:
+                print(f"Warning: Could not initialize GPU landmarkers ({e}). Using CPU.")
         
-        self.hands = self.mp_hands.Hands(
-            max_num_hands=2,
-            min_detection_confidence=self.config['detection']['min_detection_confidence'],
-            min_tracking_confidence=self.config['detection']['min_tracking_confidence']
-        )
+        if not self.using_gpu:
+            self.face_mesh = self.mp_face_mesh.FaceMesh(
+                max_num_faces=1,
+                refine_landmarks=True,
+                min_detection_confidence=self.config['detection']['min_detection_confidence'],
+                min_tracking_confidence=self.config['detection']['min_tracking_confidence']
+            )
+            
+            self.hands = self.mp_hands.Hands(
+                max_num_hands=2,
+                min_detection_confidence=self.config['detection']['min_detection_confidence'],
+                min_tracking_confidence=self.config['detection']['min_tracking_confidence']
+            )
         
-        # Alert state
-        self.last_alert_time = 0
-        self.consecutive_detections = 0
+        # Face and hand graphs are independent, so run them side by side.
+        # MediaPipe releases the GIL inside its C++ graph and each solution
+        # object is only ever used from one task at a time.
+        self._pool = ThreadPoolExecutor(max_workers=2)
+        
+        # Alert state (last_alert_time is on the time.monotonic() clock)
+        self.last_alert_time = -math.inf
         self.alert_cooldown = self.config['alert']['alert_cooldown_seconds']
         
-        # Hand position history for motion tracking
-        self.hand_position_history = []
-        self.max_history_frames = self.config['detection'].get('motion_history_frames', 5)
+        # Per-stream detection state: hand position ring buffer for motion tracking
+        # and the consecutive-detection counter, kept together in one object
+        # (at least one slot: with 0 nothing was ever kept, which still means no motion)
+        self.max_history_frames = max(
+            1, int(self.config['detection'].get('motion_history_frames', 5))
+        )
+        self._state = _DetectionState(self.max_history_frames)
+        
+        # Compile (or load from numba's on-disk cache) the motion kernels now, with
+        # the argument types used per frame, so the first detected hand doesn't
+        # stall the video loop; a no-op without numba
+        _mean_motion(self._state.hist, 0, 0)
+        _motion_sequence(self._state.hist, 0, 0, np.zeros((0, 3), dtype=np.float32),
+                         np.zeros(0, dtype=bool), np.zeros(0))
+        if NUMBA_AVAILABLE:
+            # Negative gate limits can never pass, so the history is left untouched
+            zeros3 = np.zeros(3, dtype=np.float32)
+            _rub_step(np.zeros((2, len(LEFT_EYE_IDX), 3), dtype=np.float32), zeros3, zeros3,
+                      np.full(2, -1.0, dtype=np.float32), self._state.hist, 0, 0)
         
         # Initialize pygame for sound alerts
         if PYGAME_AVAILABLE and self.config['alert']['sound_enabled']:
@@ -67,11 +360,130 @@ class BabyMonitor:
         else:
             self.sound_enabled = False
         
-        # FPS tracking
-        self.fps_start_time = time.time()
+        # Load the alert sound once; None falls back to a system beep
+        self._alert_sound = None
+        if self.sound_enabled:
+            sound_file = self.config['alert'].get('sound_file', 'alert.wav')
+            try:
+                self._alert_sound = pygame.mixer.Sound(sound_file)
+            except Exception:
+                print(f"Warning: Could not load {sound_file}. Using system beep for alerts.")
+        
+        # Alerts are dispatched on a background thread fed by this queue
+        self._alert_queue = queue.Queue()
+        self._alert_thread = threading.Thread(target=self._alert_worker, daemon=True)
+        self._alert_thread.start()
+        
+        # Reusable frame buffers, allocated on the first frame
+        self._small_buf = None
+        self._rgb_buf = None
+        
+        # Fingertip [x_px, y_px, depth], rewritten in place for every hand
+        self._tip_buf = np.zeros(3, dtype=np.float32)
+        
+        # Signals the capture thread to stop
+        self._stop_event = threading.Event()
+        
+        # Set by cleanup(); the models and threads are gone after that
+        self._closed = False
+        
+        # FPS tracking (the clock is only read once every _fps_report_every frames)
+        self._fps_t0 = time.monotonic_ns()
+        self._fps_report_every = max(1, int(self.config['camera'].get('fps', 30)))
         self.fps_frame_count = 0
         self.current_fps = 0
         
+        self._cache_hot_config()
+        
+    def _create_gpu_landmarkers(self):
+        """Create MediaPipe Tasks face and hand landmarkers on the GPU delegate
+        
+        Requires the face_landmarker.task and hand_landmarker.task model bundles
+        (paths configurable via detection.face_model_path / hand_model_path).
+        """
+        vision = mp.tasks.vision
+        BaseOptions = mp.tasks.BaseOptions
+        detection = self.config['detection']
+        
+        face_landmarker = vision.FaceLandmarker.create_from_options(
+            vision.FaceLandmarkerOptions(
+                base_options=BaseOptions(
+                    model_asset_path=detection.get('face_model_path', 'face_landmarker.task'),
+                    delegate=BaseOptions.Delegate.GPU
+                ),
+                running_mode=vision.RunningMode.VIDEO,
+                num_faces=1,
+                min_face_detection_confidence=detection['min_detection_confidence'],
+                min_tracking_confidence=detection['min_tracking_confidence']
+            )
+        )
+        
+        try:
+            hand_landmarker = vision.HandLandmarker.create_from_options(
+                vision.HandLandmarkerOptions(
+                    base_options=BaseOptions(
+                        model_asset_path=detection.get('hand_model_path', 'hand_landmarker.task'),
+                        delegate=BaseOptions.Delegate.GPU
+                    ),
+                    running_mode=vision.RunningMode.VIDEO,
+                    num_hands=2,
+                    min_hand_detection_confidence=detection['min_detection_confidence'],
+                    min_tracking_confidence=detection['min_tracking_confidence']
+                )
+            )
+        except Exception:
+            face_landmarker.close()
+            raise
+        
+        return (
+            _TasksLandmarker(face_landmarker, 'face_landmarks', 'multi_face_landmarks',
+                             LandmarkArray.from_landmarks),
+            _TasksLandmarker(hand_landmarker, 'hand_landmarks', 'multi_hand_landmarks',
+                             _to_landmark_pb2)
+        )
+    
+    def _cache_hot_config(self):
+        """Bind config values read on every frame as attributes
+        
+        Saves the nested dict lookups in the per-frame methods. Call this again
+        after modifying self.config at runtime.
+        """
+        detection = self.config['detection']
+        display = self.config['display']
+        
+        self.eye_rub_threshold = detection['eye_rub_threshold']
+        self.depth_threshold = detection.get('depth_threshold', 0.05)
+        self.motion_threshold = detection.get('motion_threshold', 0.01)
+        self.consecutive_threshold = detection['consecutive_frames_threshold']
+        self.inference_width = detection.get('inference_width', 480)
+        self.use_opencl = detection.get('use_opencl', False) and cv2.ocl.haveOpenCL()
+        self.face_cache_frames = detection.get('face_cache_frames', 30)
+        self.show_fps = display['show_fps']
+        self.show_video = display['show_video']
+        self.window_name = display['window_name']
+        
+        # Pixel-space thresholds derived from the above, recomputed per frame size
+        self._scale_wh = None
+        
+        # Eye points reused while the face stays still (see _eye_points)
+        self._face_cache_key = None
+        self._face_cache_points = None
+        self._face_cache_age = 0
+    
+    def _frame_thresholds(self, image_width, image_height):
+        """Cache the pixel-space thresholds, keyed on the frame size (w, h)"""
+        if (image_width, image_height) != self._scale_wh:
+            # Turns a per-eye landmark sum straight into [x_px, y_px, depth] means
+            n = len(LEFT_EYE_IDX)
+            self._eye_scale = np.array([image_width / n, image_height / n, 1.0 / n],
+                                       dtype=np.float32)
+            # [distance^2, depth^2] limits for <=; nextafter keeps the distance strict (<)
+            near_dist_sq = np.float32((self.eye_rub_threshold * image_width) ** 2)
+            self._gate_thresh = np.array([np.nextafter(near_dist_sq, np.float32(0.0)),
+                                          self.depth_threshold ** 2], dtype=np.float32)
+            self._motion_px = self.motion_threshold * image_width
+            self._scale_wh = (image_width, image_height)
+    
     def load_config(self, config_path):
         """Load configuration from JSON file"""
         try:
@@ -95,7 +507,11 @@ class BabyMonitor:
                 "min_tracking_confidence": 0.5,
                 "consecutive_frames_threshold": 2,
                 "motion_threshold": 0.004,
-                "motion_history_frames": 5
+                "motion_history_frames": 5,
+                "inference_width": 480,
+                "use_gpu": False,
+                "use_opencl": False,
+                "face_cache_frames": 30
             },
             "alert": {
                 "sound_enabled": False,
@@ -111,136 +527,239 @@ class BabyMonitor:
     
     def calculate_distance(self, point1, point2):
         """Calculate Euclidean distance between two points"""
-        return np.sqrt((point1[0] - point2[0])**2 + (point1[1] - point2[1])**2)
+        return math.hypot(point1[0] - point2[0], point1[1] - point2[1])
+    
+    @property
+    def consecutive_detections(self):
+        """Number of consecutive frames in which rubbing was detected"""
+        return self._state.consecutive
+    
+    @consecutive_detections.setter
+    def consecutive_detections(self, value):
+        self._state.consecutive = value
+    
+    @property
+    def hand_position_history(self):
+        """Recorded hand positions, oldest first, as an (n, 2) array copy"""
+        state = self._state
+        order = (state.head - state.count + np.arange(state.count)) % len(state.hist)
+        return state.hist[order]
+    
+    @hand_position_history.setter
+    def hand_position_history(self, positions):
+        """Replace the history with the given positions, oldest first"""
+        self.reset_history()
+        for position in positions:
+            self._push_hand_position(position)
+    
+    def reset_history(self):
+        """Forget all recorded hand positions (the buffer itself is kept)"""
+        self._state.head = 0
+        self._state.count = 0
+    
+    def _push_hand_position(self, position):
+        """Write a position into the ring buffer, overwriting the oldest entry"""
+        state = self._state
+        state.head, state.count = _ring_push(state.hist, state.head, state.count,
+                                             position[0], position[1])
     
     def calculate_hand_motion(self, current_position):
         """Calculate hand motion/velocity based on position history
         
         Args:
-            current_position: Current hand position as [x, y] array
+            current_position: Current hand position as an (x, y) pair; a plain
+                tuple is enough, only the first two items are read
             
         Returns:
             float: Average motion magnitude (velocity) over history frames
         """
-        # Add current position to history (store as list to avoid numpy overhead)
-        self.hand_position_history.append([current_position[0], current_position[1]])
-        
-        # Keep only the last N frames
-        if len(self.hand_position_history) > self.max_history_frames:
-            self.hand_position_history.pop(0)
+        self._push_hand_position(current_position)
+        state = self._state
+        return _mean_motion(state.hist, state.head, state.count)
+    
+    def calculate_hand_motion_batch(self, positions):
+        """Add several positions at once and return the resulting hand motion
         
-        # Need at least 2 positions to calculate motion
-        if len(self.hand_position_history) < 2:
-            return 0.0
+        Equivalent to calling calculate_hand_motion() for each position in turn
+        and keeping the last result, but runs as a single kernel call.
         
-        # Calculate motion between consecutive frames
-        motions = []
-        for i in range(1, len(self.hand_position_history)):
-            prev_pos = self.hand_position_history[i - 1]
-            curr_pos = self.hand_position_history[i]
-            motion = self.calculate_distance(prev_pos, curr_pos)
-            motions.append(motion)
+        Args:
+            positions: (N, 2) array-like of hand positions, oldest first
+            
+        Returns:
+            float: Average motion magnitude (velocity) over history frames
+        """
+        positions = np.asarray(positions, dtype=np.float32).reshape(-1, 2)
+        state = self._state
+        if not len(positions):
+            return _mean_motion(state.hist, state.head, state.count)
         
-        # Return average motion magnitude
-        return np.mean(motions) if motions else 0.0
+        # Every position counts as near an eye, so each one is pushed in turn
+        motion = np.zeros(len(positions))
+        state.head, state.count = _motion_sequence(
+            state.hist, state.head, state.count, positions,
+            np.ones(len(positions), dtype=bool), motion
+        )
+        return float(motion[-1])
     
-    def get_eye_regions(self, face_landmarks, image_width, image_height):
-        """Extract eye region coordinates from face landmarks"""
-        # Left eye indices (approximate center region)
-        left_eye_indices = [33, 133, 160, 159, 158, 157, 173]
-        # Right eye indices (approximate center region)
-        right_eye_indices = [362, 263, 387, 386, 385, 384, 398]
-        
-        left_eye_points = []
-        right_eye_points = []
-        left_eye_depths = []
-        right_eye_depths = []
+    def _eye_points(self, face_landmarks):
+        """Gather the eye landmarks into a (2, 7, 3) float32 array (left, right)
         
-        for idx in left_eye_indices:
-            landmark = face_landmarks.landmark[idx]
-            left_eye_points.append([landmark.x * image_width, landmark.y * image_height])
-            left_eye_depths.append(landmark.z)
+        While the outer eye corners and upper lids stay put (to 1/1000 of the
+        frame), the previous result is returned for up to face_cache_frames frames
+        instead of decoding all 14 landmarks again. The returned array must not
+        be modified.
+        """
+        if isinstance(face_landmarks, LandmarkArray):
+            return face_landmarks.xyz[_EYE_IDX_ARR].reshape(2, len(LEFT_EYE_IDX), 3)
+        if not self.face_cache_frames:
+            return _lm_to_np(face_landmarks, _EYE_IDX).reshape(2, len(LEFT_EYE_IDX), 3)
         
-        for idx in right_eye_indices:
-            landmark = face_landmarks.landmark[idx]
-            right_eye_points.append([landmark.x * image_width, landmark.y * image_height])
-            right_eye_depths.append(landmark.z)
+        landmark = face_landmarks.landmark
+        l_corner, l_lid, r_corner, r_lid = [landmark[i] for i in _FACE_KEY_IDX]
+        key = (int(l_corner.x * 1000), int(l_corner.y * 1000), int(l_corner.z * 1000),
+               int(l_lid.x * 1000), int(l_lid.y * 1000), int(l_lid.z * 1000),
+               int(r_corner.x * 1000), int(r_corner.y * 1000), int(r_corner.z * 1000),
+               int(r_lid.x * 1000), int(r_lid.y * 1000), int(r_lid.z * 1000))
+        if key == self._face_cache_key and self._face_cache_age < self.face_cache_frames:
+            self._face_cache_age += 1
+            return self._face_cache_points
         
-        # Calculate centers
-        left_eye_center = np.mean(left_eye_points, axis=0)
-        right_eye_center = np.mean(right_eye_points, axis=0)
+        eye_points = _lm_to_np(face_landmarks, _EYE_IDX).reshape(2, len(LEFT_EYE_IDX), 3)
+        self._face_cache_key = key
+        self._face_cache_points = eye_points
+        self._face_cache_age = 0
+        return eye_points
+    
+    def _eye_positions(self, face_landmarks, image_width, image_height):
+        """Return a (2, 3) array of [x_px, y_px, depth] for the left and right eye"""
+        if isinstance(face_landmarks, np.ndarray):
+            eye_points = face_landmarks
+        else:
+            eye_points = self._eye_points(face_landmarks)
         
-        # Calculate average depth
-        left_eye_depth = np.mean(left_eye_depths)
-        right_eye_depth = np.mean(right_eye_depths)
+        # One sum over the contiguous (2, 7, 3) block, then a cached scale that folds
+        # the 1/7 of the mean into the pixel conversion
+        self._frame_thresholds(image_width, image_height)
+        return np.add.reduce(eye_points, axis=1) * self._eye_scale
+    
+    def get_eye_regions(self, face_landmarks, image_width, image_height):
+        """Extract eye region coordinates from face landmarks
         
-        return left_eye_center, right_eye_center, left_eye_depth, right_eye_depth
+        Args:
+            face_landmarks: MediaPipe face landmarks, a LandmarkArray, or the eye
+                points array already gathered by _eye_points()
+            image_width: Frame width in pixels
+            image_height: Frame height in pixels
+        """
+        eyes = self._eye_positions(face_landmarks, image_width, image_height)
+        return eyes[0, :2], eyes[1, :2], eyes[0, 2], eyes[1, 2]
     
     def detect_eye_rubbing(self, face_landmarks, hand_landmarks, image_width, image_height):
-        """Detect if hand is rubbing eye region (requires both proximity AND motion)"""
+        """Detect if hand is rubbing eye region (requires both proximity AND motion)
+        
+        face_landmarks may also be the eye points array from _eye_points(), so
+        callers checking several hands against one face gather it only once.
+        """
         if face_landmarks is None or hand_landmarks is None:
             # Clear hand position history if no hand is detected
-            self.hand_position_history = []
+            self._state.count = 0
             return False
         
-        # Get eye regions
-        left_eye_center, right_eye_center, left_eye_depth, right_eye_depth = self.get_eye_regions(
-            face_landmarks, image_width, image_height
-        )
+        self._frame_thresholds(image_width, image_height)
         
-        # Get hand fingertip positions (index finger tip and thumb tip)
-        index_finger_tip = hand_landmarks.landmark[self.mp_hands.HandLandmark.INDEX_FINGER_TIP]
-        index_pos = np.array([index_finger_tip.x * image_width, index_finger_tip.y * image_height])
-        index_depth = index_finger_tip.z
-        
-        # Calculate distances to eyes
-        dist_to_left_eye = self.calculate_distance(index_pos, left_eye_center)
-        dist_to_right_eye = self.calculate_distance(index_pos, right_eye_center)
+        if isinstance(face_landmarks, np.ndarray):
+            eye_points = face_landmarks
+        else:
+            eye_points = self._eye_points(face_landmarks)
         
-        # Normalize distances by image width
-        normalized_dist_left = dist_to_left_eye / image_width
-        normalized_dist_right = dist_to_right_eye / image_width
+        # Get hand fingertip position (index finger tip) as [x_px, y_px, depth]
+        # Scalar stores into a preallocated buffer are cheaper than building a new array
+        index_finger_tip = hand_landmarks.landmark[INDEX_FINGER_TIP]
+        index_pos = self._tip_buf
+        index_pos[0] = index_finger_tip.x * image_width
+        index_pos[1] = index_finger_tip.y * image_height
+        index_pos[2] = index_finger_tip.z
         
-        # Check if hand is close to either eye
-        threshold = self.config['detection']['eye_rub_threshold']
-        depth_threshold = self.config['detection'].get('depth_threshold', 0.05)
+        if NUMBA_AVAILABLE:
+            # The rest of the frame (eye centres, gates, history update, motion) as
+            # one compiled call; the NumPy version below is the no-numba fallback
+            state = self._state
+            is_near_eye, hand_motion, state.head, state.count = _rub_step(
+                eye_points, self._eye_scale, index_pos, self._gate_thresh,
+                state.hist, state.head, state.count
+            )
+            return is_near_eye and hand_motion >= self._motion_px
         
-        # Check left eye: hand must be close in 2D AND at approximately the same depth (pressing on eye)
-        # The hand should be within a small depth range around the eye, not just in front
-        left_depth_diff = abs(index_depth - left_eye_depth)
-        left_eye_close = (normalized_dist_left < threshold and 
-                         left_depth_diff <= depth_threshold)
+        # Eye positions (2, 3) as [x_px, y_px, depth], left then right
+        eyes = self._eye_positions(eye_points, image_width, image_height)
         
-        # Check right eye: hand must be close in 2D AND at approximately the same depth (pressing on eye)
-        # The hand should be within a small depth range around the eye, not just in front
-        right_depth_diff = abs(index_depth - right_eye_depth)
-        right_eye_close = (normalized_dist_right < threshold and 
-                          right_depth_diff <= depth_threshold)
+        # Check both eyes at once: hand must be close in 2D AND at approximately the
+        # same depth (pressing on eye), not just in front. Squared distance and depth
+        # are compared against squared thresholds in a single (2, 2) <= (2,) test,
+        # so there is no sqrt and no separate branch per gate.
+        offsets = eyes - index_pos
+        offsets *= offsets
+        gates = (offsets @ _GATE_PROJ) <= self._gate_thresh
+        is_near_eye = bool((gates[:, 0] & gates[:, 1]).any())
         
-        is_near_eye = left_eye_close or right_eye_close
+        # If hand is not near eye, clear the position history and skip motion tracking
+        if not is_near_eye:
+            self._state.count = 0
+            return False
         
         # Calculate hand motion (velocity)
         hand_motion = self.calculate_hand_motion(index_pos)
         
-        # Normalize motion by image width for consistency
-        normalized_motion = hand_motion / image_width
-        
-        # Get motion threshold from config
-        motion_threshold = self.config['detection'].get('motion_threshold', 0.01)
-        
         # Only detect rubbing if hand is near eye AND there's sufficient motion
+        # (motion_threshold is normalized by image width)
         # This prevents false positives when hand is just resting on face
-        is_rubbing = is_near_eye and (normalized_motion >= motion_threshold)
+        return hand_motion >= self._motion_px
+    
+    def detect_eye_rubbing_batch(self, face_landmarks, hand_positions, image_width, image_height):
+        """Run detect_eye_rubbing over a sequence of fingertip positions for one face
         
-        # If hand is not near eye, clear the position history
-        if not is_near_eye:
-            self.hand_position_history = []
+        Gives the same per-frame results, and leaves the same hand history, as
+        calling detect_eye_rubbing once per position, but the proximity check is
+        one vectorized pass and the motion history one kernel call.
+        
+        Args:
+            face_landmarks: MediaPipe face landmarks, a LandmarkArray, or the eye points array
+                already gathered by _eye_points()
+            hand_positions: (F, 3) array-like of normalized index finger tip
+                [x, y, z] positions, oldest first
+            image_width: Frame width in pixels
+            image_height: Frame height in pixels
+            
+        Returns:
+            np.ndarray: (F,) bool array, True where rubbing was detected
+        """
+        # Scale in float64 and round once, exactly like the per-frame fingertip buffer
+        tips = (np.asarray(hand_positions, dtype=np.float64).reshape(-1, 3)
+                * (image_width, image_height, 1.0)).astype(np.float32)
+        if face_landmarks is None:
+            # Every frame would clear the history, as in detect_eye_rubbing
+            if len(tips):
+                self._state.count = 0
+            return np.zeros(len(tips), dtype=bool)
         
-        return is_rubbing
+        eyes = self._eye_positions(face_landmarks, image_width, image_height)
+        
+        # (F, 2, 3) squared offsets from each fingertip to both eyes, gated as above
+        offsets = eyes[np.newaxis] - tips[:, np.newaxis]
+        offsets *= offsets
+        near = ((offsets @ _GATE_PROJ) <= self._gate_thresh).all(axis=2).any(axis=1)
+        
+        motion = np.zeros(len(tips))
+        state = self._state
+        state.head, state.count = _motion_sequence(
+            state.hist, state.head, state.count, tips, near, motion
+        )
+        return near & (motion >= self._motion_px)
     
     def trigger_alert(self):
         """Trigger an alert (sound and/or visual)"""
-        current_time = time.time()
+        current_time = time.monotonic()
         
         # Check cooldown
         if current_time - self.last_alert_time < self.alert_cooldown:
@@ -248,6 +767,20 @@ class BabyMonitor:
         
         self.last_alert_time = current_time
         
+        # Sound and console output run on the alert thread so their I/O
+        # never stalls frame processing
+        self._alert_queue.put_nowait(time.time())
+    
+    def _alert_worker(self):
+        """Dispatch queued alerts until a None sentinel arrives"""
+        while True:
+            alert_time = self._alert_queue.get()
+            if alert_time is None:
+                break
+            self._dispatch_alert(alert_time)
+    
+    def _dispatch_alert(self, alert_time):
+        """Play the alert sound and print the console alert"""
         # Sound alert
         if self.sound_enabled:
             try:
@@ -257,7 +790,7 @@ class BabyMonitor:
                 print(f"Warning: Could not play alert sound: {e}")
         
         # Console alert
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(alert_time))
         print(f"\n{'='*50}")
         print(f"⚠️  ALERT: Eye rubbing detected! ({timestamp})")
         print(f"{'='*50}\n")
@@ -268,12 +801,9 @@ class BabyMonitor:
             return
         
         try:
-            # Try to load custom sound file
-            sound_file = self.config['alert'].get('sound_file', 'alert.wav')
-            try:
-                sound = pygame.mixer.Sound(sound_file)
-                sound.play()
-            except:
+            if self._alert_sound is not None:
+                self._alert_sound.play()
+            else:
                 # If custom sound not available, generate a beep
                 self.generate_beep_sound()
         except Exception as e:
@@ -290,12 +820,13 @@ class BabyMonitor:
     def update_fps(self):
         """Update FPS calculation"""
         self.fps_frame_count += 1
-        elapsed_time = time.time() - self.fps_start_time
         
-        if elapsed_time > 1.0:
-            self.current_fps = self.fps_frame_count / elapsed_time
+        # Roughly once per second at the configured camera FPS
+        if self.fps_frame_count >= self._fps_report_every:
+            now = time.monotonic_ns()
+            self.current_fps = self.fps_frame_count * 1e9 / (now - self._fps_t0)
             self.fps_frame_count = 0
-            self.fps_start_time = time.time()
+            self._fps_t0 = now
     
     def draw_overlays(self, frame, face_detected, hands_detected, is_rubbing):
         """Draw status overlays on the frame"""
@@ -311,7 +842,7 @@ class BabyMonitor:
                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, status_color, 2)
         
         # Draw FPS if enabled
-        if self.config['display']['show_fps']:
+        if self.show_fps:
             fps_text = f"FPS: {self.current_fps:.1f}"
             cv2.putText(frame, fps_text, (width - 120, 25),
                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
@@ -328,67 +859,144 @@ class BabyMonitor:
         
         return frame
     
-    def process_frame(self, frame):
-        """Process a single frame for detection"""
-        # Convert to RGB for MediaPipe
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    def process_frame(self, frame, annotate=True):
+        """Process a single frame for detection
+        
+        Args:
+            frame: BGR frame from the camera
+            annotate: Draw landmarks and overlays onto the frame; headless
+                callers pass False to skip all drawing
+        """
         height, width = frame.shape[:2]
         
-        # Process face and hands
-        face_results = self.face_mesh.process(rgb_frame)
-        hand_results = self.hands.process(rgb_frame)
+        # Run detection on a downsampled copy; landmarks are normalized to [0, 1]
+        # so they still map onto the full-resolution frame used for drawing
+        inference_width = self.inference_width
+        downsample = width > inference_width
+        inference_size = (inference_width, round(height * inference_width / width))
+        
+        if self.use_opencl:
+            # Resize and convert on the GPU (OpenCL T-API); only the small RGB
+            # image is downloaded since MediaPipe needs a NumPy array
+            umat = cv2.UMat(frame)
+            if downsample:
+                umat = cv2.resize(umat, inference_size, interpolation=cv2.INTER_AREA)
+            rgb_frame = cv2.cvtColor(umat, cv2.COLOR_BGR2RGB).get()
+        else:
+            inference_frame = frame
+            if downsample:
+                inference_shape = (inference_size[1], inference_size[0], 3)
+                if self._small_buf is None or self._small_buf.shape != inference_shape:
+                    self._small_buf = np.empty(inference_shape, dtype=np.uint8)
+                inference_frame = cv2.resize(frame, inference_size, dst=self._small_buf,
+                                             interpolation=cv2.INTER_AREA)
+            
+            # Convert to RGB for MediaPipe into a reused buffer (MediaPipe copies
+            # the image, so sharing it between the two parallel calls is safe)
+            if self._rgb_buf is None or self._rgb_buf.shape != inference_frame.shape:
+                self._rgb_buf = np.empty_like(inference_frame)
+            rgb_frame = cv2.cvtColor(inference_frame, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
+        
+        # Process face and hands in parallel
+        future_face = self._pool.submit(self.face_mesh.process, rgb_frame)
+        future_hand = self._pool.submit(self.hands.process, rgb_frame)
+        face_results = future_face.result()
+        hand_results = future_hand.result()
         
         face_detected = face_results.multi_face_landmarks is not None
         hands_detected = hand_results.multi_hand_landmarks is not None
         is_rubbing = False
         
+        # Gather eye landmarks once and share them with every hand check below
+        eye_points = None
+        
         # Draw face mesh
         if face_results.multi_face_landmarks:
             for face_landmarks in face_results.multi_face_landmarks:
+                eye_points = self._eye_points(face_landmarks)
+                
                 # Draw eye regions
-                left_eye_center, right_eye_center, _, _ = self.get_eye_regions(
-                    face_landmarks, width, height
-                )
-                cv2.circle(frame, tuple(left_eye_center.astype(int)), 5, (0, 255, 255), -1)
-                cv2.circle(frame, tuple(right_eye_center.astype(int)), 5, (0, 255, 255), -1)
+                if annotate:
+                    left_eye_center, right_eye_center, _, _ = self.get_eye_regions(
+                        eye_points, width, height
+                    )
+                    cv2.circle(frame, tuple(left_eye_center.astype(int)), 5, (0, 255, 255), -1)
+                    cv2.circle(frame, tuple(right_eye_center.astype(int)), 5, (0, 255, 255), -1)
         
         # Draw hand landmarks and check for eye rubbing
         if hand_results.multi_hand_landmarks:
             for hand_landmarks in hand_results.multi_hand_landmarks:
-                self.mp_drawing.draw_landmarks(
-                    frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS
-                )
+                if annotate:
+                    self.mp_drawing.draw_landmarks(
+                        frame, hand_landmarks, self.mp_hands.HAND_CONNECTIONS
+                    )
                 
                 # Check for eye rubbing
-                if face_results.multi_face_landmarks:
+                if eye_points is not None:
                     if self.detect_eye_rubbing(
-                        face_results.multi_face_landmarks[0],
+                        eye_points,
                         hand_landmarks,
                         width, height
                     ):
                         is_rubbing = True
         
-        # Handle eye rubbing detection
-        if is_rubbing:
-            self.consecutive_detections += 1
-            if self.consecutive_detections >= self.config['detection']['consecutive_frames_threshold']:
-                self.trigger_alert()
-        else:
-            self.consecutive_detections = 0
+        # Handle eye rubbing detection (the count resets to 0 on any miss)
+        state = self._state
+        state.consecutive = (state.consecutive + 1) * is_rubbing
+        if state.consecutive >= self.consecutive_threshold:
+            self.trigger_alert()
         
         # Draw overlays
-        if self.config['display']['show_video']:
+        if annotate and self.show_video:
             frame = self.draw_overlays(frame, face_detected, hands_detected, is_rubbing)
         
         return frame, is_rubbing
     
+    def _grab_loop(self, cap, frames):
+        """Capture frames on a background thread, keeping only the newest one
+        
+        The loop owns the capture and releases it on exit, so the device is
+        never released underneath a read that is still in progress.
+        
+        Args:
+            cap: Opened cv2.VideoCapture
+            frames: Queue(maxsize=1) shared with the processing loop; a None
+                entry tells the consumer that capture has failed
+        """
+        try:
+            while not self._stop_event.is_set():
+                ret, frame = cap.read()
+                
+                if not ret:
+                    print("Error: Failed to grab frame")
+                    frame = None
+                
+                # Drop the stale frame so the consumer always sees the latest one
+                try:
+                    frames.put_nowait(frame)
+                except queue.Full:
+                    try:
+                        frames.get_nowait()
+                    except queue.Empty:
+                        pass
+                    frames.put_nowait(frame)
+                
+                if frame is None:
+                    break
+        finally:
+            cap.release()
+    
     def run(self, camera_source=None, show_display=None):
-        """Run the baby monitor"""
+        """Run the baby monitor (once; the monitor is cleaned up when this returns)"""
+        if self._closed:
+            raise RuntimeError("BabyMonitor has been cleaned up; "
+                               "create a new instance to run again")
+        
         if camera_source is None:
             camera_source = self.config['camera']['source']
         
         if show_display is None:
-            show_display = self.config['display']['show_video']
+            show_display = self.show_video
         
         # Open camera
         cap = cv2.VideoCapture(camera_source)
@@ -403,41 +1011,99 @@ class BabyMonitor:
         cap.set(cv2.CAP_PROP_FPS, self.config['camera']['fps'])
         
         print("Baby Monitor Started!")
-        print("Press 'q' to quit")
+        print("Press 'q' to quit" if show_display else "Press Ctrl+C to quit")
         print("-" * 50)
         
+        # Capture runs on its own thread so camera I/O overlaps inference
+        frames = queue.Queue(maxsize=1)
+        self._stop_event.clear()
+        grabber = threading.Thread(target=self._grab_loop, args=(cap, frames), daemon=True)
+        grabber.start()
+        
         try:
-            while True:
-                ret, frame = cap.read()
+            if show_display:
+                self._run_display(frames)
+            else:
+                self._run_headless(frames)
+                    
+        except KeyboardInterrupt:
+            print("\nStopping baby monitor...")
+        finally:
+            # The grabber releases the capture itself once its read returns
+            self._stop_event.set()
+            grabber.join(timeout=1.0)
+            if show_display:
+                cv2.destroyAllWindows()
+            self.cleanup()
+    
+    def _run_display(self, frames):
+        """Processing loop with a video window; 'q' quits"""
+        while True:
+            frame = frames.get()
+            
+            if frame is None:
+                break
+            
+            # Process frame
+            frame, is_rubbing = self.process_frame(frame)
+            
+            # Update FPS
+            self.update_fps()
+            
+            # Display frame
+            cv2.imshow(self.window_name, frame)
+            
+            # Check for quit
+            if cv2.waitKey(1) & 0xFF == ord('q'):
+                print("\nStopping baby monitor...")
+                break
+    
+    def _run_headless(self, frames):
+        """Processing loop without any HighGUI calls; Ctrl+C (SIGINT) quits"""
+        # signal handlers can only be installed from the main thread; elsewhere
+        # the KeyboardInterrupt handling in run() still applies
+        previous_handler = None
+        if threading.current_thread() is threading.main_thread():
+            previous_handler = signal.signal(
+                signal.SIGINT, lambda signum, stack: self._stop_event.set()
+            )
+        
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    frame = frames.get(timeout=0.1)
+                except queue.Empty:
+                    continue
                 
-                if not ret:
-                    print("Error: Failed to grab frame")
+                if frame is None:
                     break
                 
-                # Process frame
-                frame, is_rubbing = self.process_frame(frame)
+                # Process frame without drawing anything
+                self.process_frame(frame, annotate=False)
                 
                 # Update FPS
                 self.update_fps()
-                
-                # Display frame
-                if show_display:
-                    cv2.imshow(self.config['display']['window_name'], frame)
-                
-                # Check for quit
-                if cv2.waitKey(1) & 0xFF == ord('q'):
-                    print("\nStopping baby monitor...")
-                    break
-                    
-        except KeyboardInterrupt:
-            print("\nStopping baby monitor...")
         finally:
-            cap.release()
-            cv2.destroyAllWindows()
-            self.cleanup()
+            if previous_handler is not None:
+                signal.signal(signal.SIGINT, previous_handler)
+        
+        if self._stop_event.is_set():
+            print("\nStopping baby monitor...")
     
     def cleanup(self):
-        """Cleanup resources"""
+        """Cleanup resources (safe to call more than once)"""
+        if self._closed:
+            return
+        self._closed = True
+        
+        self._pool.shutdown()
+        self.face_mesh.close()
+        self.hands.close()
+        
+        # Let pending alerts finish before shutting down the mixer
+        self._alert_queue.put(None)
+        self._alert_thread.join(timeout=2.0)
+        
         if self.sound_enabled:
             try:
                 pygame.mixer.quit()
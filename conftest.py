@@ -0,0 +1,35 @@
+"""
+pytest configuration: run the suite in parallel when pytest-xdist is installed
+"""
+
+import os
+
+import pytest
+
+# Checks in test_setup.py that touch shared machine state (the camera device,
+# config.json) and must not overlap with anything else
+SERIAL_TESTS = {'test_camera', 'test_config_file'}
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_cmdline_main(config):
+    """Default to ``-n auto --dist loadfile`` if xdist is available and no -n was given
+
+    loadfile keeps each test file on one worker, so setUpClass fixtures are
+    still built once per class.
+    """
+    if os.environ.get('PYTEST_XDIST_WORKER') or not config.pluginmanager.hasplugin('xdist'):
+        return
+    if config.getoption('numprocesses', None) is None:
+        config.option.numprocesses = 'auto'
+        if config.getoption('dist', 'no') == 'no':
+            config.option.dist = 'loadfile'
+
+
+def pytest_collection_modifyitems(config, items):
+    """Mark the shared-state checks serial and pin them to a single worker"""
+    for item in items:
+        if item.name in SERIAL_TESTS:
+            item.add_marker(pytest.mark.serial)
+            # Honoured by --dist loadgroup; under loadfile they share test_setup.py's worker
+            item.add_marker(pytest.mark.xdist_group('serial'))
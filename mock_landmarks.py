@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Mock MediaPipe landmarks shared by the unit tests
+"""
+
+import functools
+from collections import namedtuple
+from types import MappingProxyType
+import numpy as np
+from baby_monitor import INDEX_FINGER_TIP, LandmarkArray, LEFT_EYE_IDX, RIGHT_EYE_IDX
+
+# Plain stand-ins for MediaPipe landmark messages (much cheaper than Mock)
+Landmark = namedtuple('Landmark', 'x y z')
+LandmarkList = namedtuple('LandmarkList', 'landmark')
+
+
+def create_mock_landmark(x, y, z):
+    """Create a mock landmark with x, y, z coordinates"""
+    return Landmark(x, y, z)
+
+
+def create_mock_face_landmarks(eye_z_depth=0.0):
+    """Create mock face landmarks with specific depth
+
+    Only the eye landmarks are present, held in a read-only mapping.
+    """
+    # Every point of an eye shares one landmark: left eye centered around
+    # x=0.3, y=0.3, right eye around x=0.7, y=0.3
+    landmark = dict.fromkeys(LEFT_EYE_IDX, Landmark(0.3, 0.3, eye_z_depth))
+    landmark.update(dict.fromkeys(RIGHT_EYE_IDX, Landmark(0.7, 0.3, eye_z_depth)))
+    return LandmarkList(landmark=MappingProxyType(landmark))
+
+
+def create_mock_face_array(eye_z_depth=0.0):
+    """Create mock face landmarks (a full 478-point mesh array) with specific depth"""
+    xyz = np.zeros((478, 3), dtype=np.float32)
+
+    # Left eye centered around x=0.3, y=0.3; right eye around x=0.7, y=0.3
+    xyz[list(LEFT_EYE_IDX)] = (0.3, 0.3, eye_z_depth)
+    xyz[list(RIGHT_EYE_IDX)] = (0.7, 0.3, eye_z_depth)
+
+    return LandmarkArray(xyz)
+
+
+@functools.lru_cache(maxsize=None)
+def create_mock_hand_landmarks(x, y, z):
+    """Create mock hand landmarks with index finger at specific position
+
+    Cached per position, so the landmarks sit in a read-only mapping: a test
+    cannot alter the object that later frames at that position get back.
+    """
+    # Only the index finger tip is read by the detector
+    return LandmarkList(landmark=MappingProxyType({INDEX_FINGER_TIP: Landmark(x, y, z)}))
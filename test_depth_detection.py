@@ -4,68 +4,40 @@ Unit tests for depth-based eye rubbing detection
 """
 
 import unittest
-from unittest.mock import Mock
-import numpy as np
 from baby_monitor import BabyMonitor
+from mock_landmarks import (LandmarkList, create_mock_face_landmarks, create_mock_hand_landmarks,
+                            create_mock_landmark)
 
 
 class TestDepthDetection(unittest.TestCase):
     """Test cases for depth-based eye rubbing detection"""
     
-    def setUp(self):
-        """Set up test fixtures"""
-        self.monitor = BabyMonitor()
-        
-    def create_mock_landmark(self, x, y, z):
-        """Create a mock landmark with x, y, z coordinates"""
-        landmark = Mock()
-        landmark.x = x
-        landmark.y = y
-        landmark.z = z
-        return landmark
+    @classmethod
+    def setUpClass(cls):
+        """Build the shared monitor and face landmark fixture once for the whole class"""
+        cls.monitor = BabyMonitor()
+        cls.face_landmarks = create_mock_face_landmarks(eye_z_depth=0.0)
     
-    def create_mock_face_landmarks(self, eye_z_depth=0.0):
-        """Create mock face landmarks with specific depth"""
-        face_landmarks = Mock()
-        face_landmarks.landmark = {}
-        
-        # Left eye indices
-        left_eye_indices = [33, 133, 160, 159, 158, 157, 173]
-        # Right eye indices
-        right_eye_indices = [362, 263, 387, 386, 385, 384, 398]
-        
-        # Create landmarks for left eye (centered around x=0.3, y=0.3)
-        for idx in left_eye_indices:
-            face_landmarks.landmark[idx] = self.create_mock_landmark(0.3, 0.3, eye_z_depth)
-        
-        # Create landmarks for right eye (centered around x=0.7, y=0.3)
-        for idx in right_eye_indices:
-            face_landmarks.landmark[idx] = self.create_mock_landmark(0.7, 0.3, eye_z_depth)
-        
-        return face_landmarks
+    @classmethod
+    def tearDownClass(cls):
+        """Release the shared monitor's models and worker threads"""
+        cls.monitor.cleanup()
     
-    def create_mock_hand_landmarks(self, x, y, z):
-        """Create mock hand landmarks with index finger at specific position"""
-        hand_landmarks = Mock()
-        hand_landmarks.landmark = {}
-        
-        # Create index finger tip landmark
-        from baby_monitor import mp
-        index_finger_tip_idx = mp.solutions.hands.HandLandmark.INDEX_FINGER_TIP
-        hand_landmarks.landmark[index_finger_tip_idx] = self.create_mock_landmark(x, y, z)
-        
-        return hand_landmarks
+    def setUp(self):
+        """Reset the per-test detection state on the shared monitor"""
+        self.monitor.reset_history()
+        self.monitor.consecutive_detections = 0
     
     def test_hand_in_front_of_eye_close_proximity(self):
         """Test: Hand in front of eye and close with motion - should detect rubbing"""
         # Eye at depth 0.0, hand at depth -0.02 (in front)
-        face_landmarks = self.create_mock_face_landmarks(eye_z_depth=0.0)
+        face_landmarks = self.face_landmarks
         
         # Simulate motion near the eye
         positions = [(0.30, 0.30), (0.32, 0.31), (0.34, 0.30), (0.32, 0.29), (0.30, 0.30)]
         result = False
         for x, y in positions:
-            hand_landmarks = self.create_mock_hand_landmarks(x=x, y=y, z=-0.02)
+            hand_landmarks = create_mock_hand_landmarks(x=x, y=y, z=-0.02)
             result = self.monitor.detect_eye_rubbing(face_landmarks, hand_landmarks, 640, 480)
         
         self.assertTrue(result, "Should detect eye rubbing when hand is in front, close, and moving")
@@ -73,8 +45,8 @@ class TestDepthDetection(unittest.TestCase):
     def test_hand_behind_eye_close_proximity(self):
         """Test: Hand behind eye but close in 2D - should NOT detect rubbing"""
         # Eye at depth 0.0, hand at depth 0.1 (behind)
-        face_landmarks = self.create_mock_face_landmarks(eye_z_depth=0.0)
-        hand_landmarks = self.create_mock_hand_landmarks(x=0.3, y=0.3, z=0.1)
+        face_landmarks = self.face_landmarks
+        hand_landmarks = create_mock_hand_landmarks(x=0.3, y=0.3, z=0.1)
         
         result = self.monitor.detect_eye_rubbing(face_landmarks, hand_landmarks, 640, 480)
         self.assertFalse(result, "Should NOT detect eye rubbing when hand is behind the eye")
@@ -82,8 +54,8 @@ class TestDepthDetection(unittest.TestCase):
     def test_hand_far_from_eye_in_2d(self):
         """Test: Hand far from eye in 2D - should NOT detect rubbing"""
         # Eye at depth 0.0, hand at depth -0.02 (in front) but far in 2D
-        face_landmarks = self.create_mock_face_landmarks(eye_z_depth=0.0)
-        hand_landmarks = self.create_mock_hand_landmarks(x=0.9, y=0.9, z=-0.02)
+        face_landmarks = self.face_landmarks
+        hand_landmarks = create_mock_hand_landmarks(x=0.9, y=0.9, z=-0.02)
         
         result = self.monitor.detect_eye_rubbing(face_landmarks, hand_landmarks, 640, 480)
         self.assertFalse(result, "Should NOT detect eye rubbing when hand is far in 2D space")
@@ -91,64 +63,41 @@ class TestDepthDetection(unittest.TestCase):
     def test_hand_at_same_depth_as_eye(self):
         """Test: Hand at same depth as eye and close with motion - should detect rubbing"""
         # Eye at depth 0.0, hand at depth 0.0 (same level)
-        face_landmarks = self.create_mock_face_landmarks(eye_z_depth=0.0)
+        face_landmarks = self.face_landmarks
         
         # Simulate motion near the eye
         positions = [(0.30, 0.30), (0.32, 0.31), (0.34, 0.30), (0.32, 0.29), (0.30, 0.30)]
         result = False
         for x, y in positions:
-            hand_landmarks = self.create_mock_hand_landmarks(x=x, y=y, z=0.0)
+            hand_landmarks = create_mock_hand_landmarks(x=x, y=y, z=0.0)
             result = self.monitor.detect_eye_rubbing(face_landmarks, hand_landmarks, 640, 480)
         
         self.assertTrue(result, "Should detect eye rubbing when hand is at same depth, close, and moving")
     
-    def test_hand_slightly_behind_within_threshold(self):
-        """Test: Hand slightly behind but within depth threshold with motion - should detect rubbing"""
-        # Eye at depth 0.0, hand at depth 0.04 (slightly behind but within 0.05 threshold)
-        face_landmarks = self.create_mock_face_landmarks(eye_z_depth=0.0)
-        
-        # Simulate motion near the eye
-        positions = [(0.30, 0.30), (0.32, 0.31), (0.34, 0.30), (0.32, 0.29), (0.30, 0.30)]
-        result = False
-        for x, y in positions:
-            hand_landmarks = self.create_mock_hand_landmarks(x=x, y=y, z=0.04)
-            result = self.monitor.detect_eye_rubbing(face_landmarks, hand_landmarks, 640, 480)
-        
-        self.assertTrue(result, "Should detect eye rubbing when hand is within depth threshold and moving")
-    
-    def test_hand_behind_beyond_threshold(self):
-        """Test: Hand behind and beyond depth threshold - should NOT detect rubbing"""
-        # Eye at depth 0.0, hand at depth 0.1 (beyond 0.05 threshold)
-        face_landmarks = self.create_mock_face_landmarks(eye_z_depth=0.0)
-        hand_landmarks = self.create_mock_hand_landmarks(x=0.3, y=0.3, z=0.1)
-        
-        result = self.monitor.detect_eye_rubbing(face_landmarks, hand_landmarks, 640, 480)
-        self.assertFalse(result, "Should NOT detect eye rubbing when hand is beyond depth threshold")
-    
     def test_right_eye_detection(self):
         """Test: Detection works for right eye as well with motion"""
         # Eye at depth 0.0, hand near right eye (x=0.7)
-        face_landmarks = self.create_mock_face_landmarks(eye_z_depth=0.0)
+        face_landmarks = self.face_landmarks
         
         # Simulate motion near the right eye
         positions = [(0.70, 0.30), (0.72, 0.31), (0.74, 0.30), (0.72, 0.29), (0.70, 0.30)]
         result = False
         for x, y in positions:
-            hand_landmarks = self.create_mock_hand_landmarks(x=x, y=y, z=-0.02)
+            hand_landmarks = create_mock_hand_landmarks(x=x, y=y, z=-0.02)
             result = self.monitor.detect_eye_rubbing(face_landmarks, hand_landmarks, 640, 480)
         
         self.assertTrue(result, "Should detect eye rubbing for right eye with motion")
     
     def test_no_face_landmarks(self):
         """Test: No detection when face landmarks are missing"""
-        hand_landmarks = self.create_mock_hand_landmarks(x=0.3, y=0.3, z=0.0)
+        hand_landmarks = create_mock_hand_landmarks(x=0.3, y=0.3, z=0.0)
         
         result = self.monitor.detect_eye_rubbing(None, hand_landmarks, 640, 480)
         self.assertFalse(result, "Should return False when face landmarks are None")
     
     def test_no_hand_landmarks(self):
         """Test: No detection when hand landmarks are missing"""
-        face_landmarks = self.create_mock_face_landmarks(eye_z_depth=0.0)
+        face_landmarks = self.face_landmarks
         
         result = self.monitor.detect_eye_rubbing(face_landmarks, None, 640, 480)
         self.assertFalse(result, "Should return False when hand landmarks are None")
@@ -157,8 +106,8 @@ class TestDepthDetection(unittest.TestCase):
         """Test: Hand far in front of eye but close in 2D - should NOT detect rubbing"""
         # Eye at depth 0.0, hand at depth -0.1 (far in front) but close in 2D
         # This simulates hand waving in front of face but not touching eye
-        face_landmarks = self.create_mock_face_landmarks(eye_z_depth=0.0)
-        hand_landmarks = self.create_mock_hand_landmarks(x=0.3, y=0.3, z=-0.1)
+        face_landmarks = self.face_landmarks
+        hand_landmarks = create_mock_hand_landmarks(x=0.3, y=0.3, z=-0.1)
         
         result = self.monitor.detect_eye_rubbing(face_landmarks, hand_landmarks, 640, 480)
         self.assertFalse(result, "Should NOT detect eye rubbing when hand is far in front of eye")
@@ -166,39 +115,80 @@ class TestDepthDetection(unittest.TestCase):
     def test_hand_very_close_depth_match(self):
         """Test: Hand at exact same depth as eye and close in 2D with motion - should detect rubbing"""
         # Eye at depth 0.0, hand at exact same depth (pressing on eye)
-        face_landmarks = self.create_mock_face_landmarks(eye_z_depth=0.0)
+        face_landmarks = self.face_landmarks
         
         # Simulate motion near the eye
         positions = [(0.30, 0.30), (0.32, 0.31), (0.34, 0.30), (0.32, 0.29), (0.30, 0.30)]
         result = False
         for x, y in positions:
-            hand_landmarks = self.create_mock_hand_landmarks(x=x, y=y, z=0.0)
+            hand_landmarks = create_mock_hand_landmarks(x=x, y=y, z=0.0)
             result = self.monitor.detect_eye_rubbing(face_landmarks, hand_landmarks, 640, 480)
         
         self.assertTrue(result, "Should detect eye rubbing when hand is at exact same depth and moving")
     
-    def test_hand_just_within_depth_threshold(self):
-        """Test: Hand just within depth threshold with motion - should detect rubbing"""
-        # Eye at depth 0.0, hand at depth 0.049 (just within 0.05 threshold)
-        face_landmarks = self.create_mock_face_landmarks(eye_z_depth=0.0)
-        
-        # Simulate motion near the eye
-        positions = [(0.30, 0.30), (0.32, 0.31), (0.34, 0.30), (0.32, 0.29), (0.30, 0.30)]
-        result = False
-        for x, y in positions:
-            hand_landmarks = self.create_mock_hand_landmarks(x=x, y=y, z=0.049)
-            result = self.monitor.detect_eye_rubbing(face_landmarks, hand_landmarks, 640, 480)
-        
-        self.assertTrue(result, "Should detect eye rubbing when hand is just within depth threshold and moving")
-    
-    def test_hand_just_outside_depth_threshold(self):
-        """Test: Hand just outside depth threshold - should NOT detect rubbing"""
-        # Eye at depth 0.0, hand at depth 0.06 (just outside 0.05 threshold)
-        face_landmarks = self.create_mock_face_landmarks(eye_z_depth=0.0)
-        hand_landmarks = self.create_mock_hand_landmarks(x=0.3, y=0.3, z=0.06)
-        
-        result = self.monitor.detect_eye_rubbing(face_landmarks, hand_landmarks, 640, 480)
-        self.assertFalse(result, "Should NOT detect eye rubbing when hand is just outside depth threshold")
+    def test_depth_threshold_boundaries(self):
+        """Test: Hand depth around the depth threshold, one shared monitor for all cases"""
+        # Eye at depth 0.0; moving cases rub near the eye, static cases hold still at it
+        moving = [(0.30, 0.30), (0.32, 0.31), (0.34, 0.30), (0.32, 0.29), (0.30, 0.30)]
+        static = [(0.30, 0.30)]
+        cases = [
+            # (hand z, positions, expected, message)
+            (0.04, moving, True,
+             "Should detect eye rubbing when hand is within depth threshold and moving"),
+            (0.1, static, False,
+             "Should NOT detect eye rubbing when hand is beyond depth threshold"),
+            (0.049, moving, True,
+             "Should detect eye rubbing when hand is just within depth threshold and moving"),
+            (0.06, static, False,
+             "Should NOT detect eye rubbing when hand is just outside depth threshold"),
+            (-0.02, moving, True,
+             "Should detect eye rubbing when hand is slightly in front and moving"),
+            (-0.1, static, False,
+             "Should NOT detect eye rubbing when hand is far in front of the eye"),
+        ]
+        
+        for z, positions, expected, message in cases:
+            with self.subTest(z=z):
+                self.monitor.reset_history()  # Reset history
+                result = False
+                for x, y in positions:
+                    hand_landmarks = create_mock_hand_landmarks(x=x, y=y, z=z)
+                    result = self.monitor.detect_eye_rubbing(
+                        self.face_landmarks, hand_landmarks, 640, 480
+                    )
+                
+                self.assertEqual(result, expected, message)
+    
+    def test_eye_regions_cached_while_face_still(self):
+        """Test: Cached eye regions refresh when an eyelid moves or after face_cache_frames"""
+        # Dedicated monitor so the cache starts empty and its state doesn't leak
+        monitor = BabyMonitor()
+        self.addCleanup(monitor.cleanup)
+        monitor.face_cache_frames = 2
+        
+        def left_eye_x(lid_y=0.3, inner_x=0.3):
+            # 159 (left upper lid) is sampled for the cache key, 133 (left inner corner) is not
+            landmark = dict(self.face_landmarks.landmark)
+            landmark[159] = create_mock_landmark(0.3, lid_y, 0.0)
+            landmark[133] = create_mock_landmark(inner_x, 0.3, 0.0)
+            left_eye_center, _, _, _ = monitor.get_eye_regions(
+                LandmarkList(landmark=landmark), 640, 480
+            )
+            return left_eye_center[0]
+        
+        still = left_eye_x()
+        
+        # Only an unsampled point moved: the cached eye points are reused
+        self.assertEqual(left_eye_x(inner_x=0.37), still)
+        
+        # The eyelid moved: the eye points are read again
+        blinked = left_eye_x(lid_y=0.2, inner_x=0.37)
+        self.assertNotEqual(blinked, still)
+        
+        # Even a still face is re-read after face_cache_frames reuses
+        for _ in range(monitor.face_cache_frames):
+            self.assertEqual(left_eye_x(lid_y=0.2, inner_x=0.44), blinked)
+        self.assertNotEqual(left_eye_x(lid_y=0.2, inner_x=0.44), blinked)
 
 
 if __name__ == '__main__':
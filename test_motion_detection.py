@@ -4,66 +4,48 @@ Unit tests for motion-based eye rubbing detection
 Tests to ensure false positives are reduced by requiring motion
 """
 
+import json
+import os
+import tempfile
 import unittest
-from unittest.mock import Mock
 import numpy as np
 from baby_monitor import BabyMonitor
+from mock_landmarks import create_mock_face_landmarks, create_mock_hand_landmarks
+
+# Pixel-space hand positions shared by the motion calculation tests
+_STATIC_POS = (100.0, 100.0)
+_MOVING = np.array([[100.0, 100.0],
+                    [110.0, 105.0],
+                    [120.0, 110.0],
+                    [130.0, 115.0]], dtype=np.float32)
 
 
 class TestMotionDetection(unittest.TestCase):
     """Test cases for motion-based eye rubbing detection"""
     
-    def setUp(self):
-        """Set up test fixtures"""
-        self.monitor = BabyMonitor()
-        
-    def create_mock_landmark(self, x, y, z):
-        """Create a mock landmark with x, y, z coordinates"""
-        landmark = Mock()
-        landmark.x = x
-        landmark.y = y
-        landmark.z = z
-        return landmark
+    @classmethod
+    def setUpClass(cls):
+        """Build the shared monitor and face landmark fixture once for the whole class"""
+        cls.monitor = BabyMonitor()
+        cls.face_landmarks = create_mock_face_landmarks(eye_z_depth=0.0)
     
-    def create_mock_face_landmarks(self, eye_z_depth=0.0):
-        """Create mock face landmarks with specific depth"""
-        face_landmarks = Mock()
-        face_landmarks.landmark = {}
-        
-        # Left eye indices
-        left_eye_indices = [33, 133, 160, 159, 158, 157, 173]
-        # Right eye indices
-        right_eye_indices = [362, 263, 387, 386, 385, 384, 398]
-        
-        # Create landmarks for left eye (centered around x=0.3, y=0.3)
-        for idx in left_eye_indices:
-            face_landmarks.landmark[idx] = self.create_mock_landmark(0.3, 0.3, eye_z_depth)
-        
-        # Create landmarks for right eye (centered around x=0.7, y=0.3)
-        for idx in right_eye_indices:
-            face_landmarks.landmark[idx] = self.create_mock_landmark(0.7, 0.3, eye_z_depth)
-        
-        return face_landmarks
+    @classmethod
+    def tearDownClass(cls):
+        """Release the shared monitor's models and worker threads"""
+        cls.monitor.cleanup()
     
-    def create_mock_hand_landmarks(self, x, y, z):
-        """Create mock hand landmarks with index finger at specific position"""
-        hand_landmarks = Mock()
-        hand_landmarks.landmark = {}
-        
-        # Create index finger tip landmark
-        import mediapipe as mp
-        index_finger_tip_idx = mp.solutions.hands.HandLandmark.INDEX_FINGER_TIP
-        hand_landmarks.landmark[index_finger_tip_idx] = self.create_mock_landmark(x, y, z)
-        
-        return hand_landmarks
+    def setUp(self):
+        """Reset the per-test detection state on the shared monitor"""
+        self.monitor.reset_history()
+        self.monitor.consecutive_detections = 0
     
     def test_static_hand_near_eye_no_motion(self):
         """Test: Static hand near eye without motion - should NOT detect rubbing"""
-        face_landmarks = self.create_mock_face_landmarks(eye_z_depth=0.0)
+        face_landmarks = self.face_landmarks
         
         # Simulate static hand at same position for multiple frames
+        hand_landmarks = create_mock_hand_landmarks(x=0.3, y=0.3, z=0.0)
         for i in range(10):
-            hand_landmarks = self.create_mock_hand_landmarks(x=0.3, y=0.3, z=0.0)
             result = self.monitor.detect_eye_rubbing(face_landmarks, hand_landmarks, 640, 480)
             
         # Last detection should be False because hand is not moving
@@ -71,7 +53,7 @@ class TestMotionDetection(unittest.TestCase):
     
     def test_moving_hand_near_eye_with_motion(self):
         """Test: Moving hand near eye with motion - should detect rubbing"""
-        face_landmarks = self.create_mock_face_landmarks(eye_z_depth=0.0)
+        face_landmarks = self.face_landmarks
         
         # Simulate hand moving near eye (rubbing motion)
         positions = [
@@ -84,7 +66,7 @@ class TestMotionDetection(unittest.TestCase):
         
         result = False
         for x, y in positions:
-            hand_landmarks = self.create_mock_hand_landmarks(x=x, y=y, z=0.0)
+            hand_landmarks = create_mock_hand_landmarks(x=x, y=y, z=0.0)
             result = self.monitor.detect_eye_rubbing(face_landmarks, hand_landmarks, 640, 480)
         
         # Should detect rubbing after several frames of motion
@@ -93,34 +75,42 @@ class TestMotionDetection(unittest.TestCase):
     def test_hand_motion_calculation_static(self):
         """Test: Motion calculation for static hand should be zero"""
         # Add same position multiple times
-        pos = np.array([100.0, 100.0])
         for i in range(5):
-            motion = self.monitor.calculate_hand_motion(pos)
+            motion = self.monitor.calculate_hand_motion(_STATIC_POS)
         
         self.assertEqual(motion, 0.0, "Motion should be zero for static hand")
     
     def test_hand_motion_calculation_moving(self):
         """Test: Motion calculation for moving hand should be positive"""
         # Add positions with increasing values (moving hand)
-        positions = [
-            np.array([100.0, 100.0]),
-            np.array([110.0, 105.0]),
-            np.array([120.0, 110.0]),
-            np.array([130.0, 115.0]),
-        ]
-        
-        motion = 0.0
-        for pos in positions:
-            motion = self.monitor.calculate_hand_motion(pos)
+        motion = self.monitor.calculate_hand_motion_batch(_MOVING)
         
         self.assertGreater(motion, 0.0, "Motion should be positive for moving hand")
     
+    def test_hand_motion_batch_matches_sequential(self):
+        """Test: Batched motion update should match feeding positions one at a time"""
+        # Longer than max_history_frames so the batch path also wraps the buffer
+        positions = [(float(i * i % 37), float(i * 3 % 11)) for i in range(15)]
+        
+        for split in (3, 12):
+            with self.subTest(split=split):
+                sequential = BabyMonitor()
+                self.addCleanup(sequential.cleanup)
+                for pos in positions:
+                    expected = sequential.calculate_hand_motion(pos)
+                
+                self.monitor.reset_history()
+                self.monitor.calculate_hand_motion_batch(positions[:split])
+                motion = self.monitor.calculate_hand_motion_batch(positions[split:])
+                
+                self.assertAlmostEqual(motion, expected, places=4)
+                np.testing.assert_array_equal(self.monitor.hand_position_history,
+                                              sequential.hand_position_history)
+    
     def test_hand_position_history_limit(self):
         """Test: Hand position history should be limited to max_history_frames"""
         # Add more positions than max_history_frames
-        for i in range(20):
-            pos = np.array([float(i), float(i)])
-            self.monitor.calculate_hand_motion(pos)
+        self.monitor.calculate_hand_motion_batch([(float(i), float(i)) for i in range(20)])
         
         self.assertEqual(
             len(self.monitor.hand_position_history), 
@@ -128,9 +118,38 @@ class TestMotionDetection(unittest.TestCase):
             f"History should be limited to {self.monitor.max_history_frames} frames"
         )
     
+    def test_minimal_history_never_detects(self):
+        """Test: A motion history of 0 or 1 frames keeps one slot and never reports motion"""
+        config = self.monitor.get_default_config()
+        for history_frames in (0, 1):
+            with self.subTest(history_frames=history_frames):
+                config['detection']['motion_history_frames'] = history_frames
+                with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+                    json.dump(config, f)
+                self.addCleanup(os.remove, f.name)
+                
+                monitor = BabyMonitor(config_path=f.name)
+                self.addCleanup(monitor.cleanup)
+                self.assertEqual(monitor.max_history_frames, 1)
+                
+                # Rubbing motion near the eye: too little history to measure it
+                for x, y in [(0.30, 0.30), (0.34, 0.32), (0.28, 0.28), (0.32, 0.30)]:
+                    hand_landmarks = create_mock_hand_landmarks(x=x, y=y, z=0.0)
+                    self.assertFalse(monitor.detect_eye_rubbing(self.face_landmarks,
+                                                                hand_landmarks, 640, 480))
+                self.assertEqual(len(monitor.hand_position_history), 1)
+    
+    def test_reset_history(self):
+        """Test: reset_history should empty the history and restart motion from zero"""
+        self.monitor.calculate_hand_motion_batch(_MOVING)
+        self.monitor.reset_history()
+        
+        self.assertEqual(len(self.monitor.hand_position_history), 0)
+        self.assertEqual(self.monitor.calculate_hand_motion(_STATIC_POS), 0.0)
+    
     def test_slow_motion_below_threshold(self):
         """Test: Very slow motion below threshold should not trigger detection"""
-        face_landmarks = self.create_mock_face_landmarks(eye_z_depth=0.0)
+        face_landmarks = self.face_landmarks
         
         # Simulate very slow motion (below motion threshold)
         positions = [
@@ -143,7 +162,7 @@ class TestMotionDetection(unittest.TestCase):
         
         result = False
         for x, y in positions:
-            hand_landmarks = self.create_mock_hand_landmarks(x=x, y=y, z=0.0)
+            hand_landmarks = create_mock_hand_landmarks(x=x, y=y, z=0.0)
             result = self.monitor.detect_eye_rubbing(face_landmarks, hand_landmarks, 640, 480)
         
         # Should NOT detect because motion is too slow (below threshold)
@@ -151,7 +170,7 @@ class TestMotionDetection(unittest.TestCase):
     
     def test_fast_motion_above_threshold(self):
         """Test: Fast motion above threshold should trigger detection"""
-        face_landmarks = self.create_mock_face_landmarks(eye_z_depth=0.0)
+        face_landmarks = self.face_landmarks
         
         # Simulate fast rubbing motion (above motion threshold)
         positions = [
@@ -164,7 +183,7 @@ class TestMotionDetection(unittest.TestCase):
         
         result = False
         for x, y in positions:
-            hand_landmarks = self.create_mock_hand_landmarks(x=x, y=y, z=0.0)
+            hand_landmarks = create_mock_hand_landmarks(x=x, y=y, z=0.0)
             result = self.monitor.detect_eye_rubbing(face_landmarks, hand_landmarks, 640, 480)
         
         # Should detect because motion is fast enough
@@ -172,7 +191,7 @@ class TestMotionDetection(unittest.TestCase):
     
     def test_hand_far_from_eye_with_motion(self):
         """Test: Hand far from eye with motion - should NOT detect"""
-        face_landmarks = self.create_mock_face_landmarks(eye_z_depth=0.0)
+        face_landmarks = self.face_landmarks
         
         # Simulate hand moving but far from eye
         positions = [
@@ -185,7 +204,7 @@ class TestMotionDetection(unittest.TestCase):
         
         result = False
         for x, y in positions:
-            hand_landmarks = self.create_mock_hand_landmarks(x=x, y=y, z=0.0)
+            hand_landmarks = create_mock_hand_landmarks(x=x, y=y, z=0.0)
             result = self.monitor.detect_eye_rubbing(face_landmarks, hand_landmarks, 640, 480)
         
         # Should NOT detect because hand is far from eye
@@ -193,7 +212,7 @@ class TestMotionDetection(unittest.TestCase):
     
     def test_hand_resting_on_face_scenario(self):
         """Test: Realistic scenario - hand resting on face without rubbing"""
-        face_landmarks = self.create_mock_face_landmarks(eye_z_depth=0.0)
+        face_landmarks = self.face_landmarks
         
         # Simulate hand moving to face, then staying still (resting)
         # This is the main false positive scenario we want to fix
@@ -207,13 +226,13 @@ class TestMotionDetection(unittest.TestCase):
         
         # Hand arrives at face and stops
         for x, y in moving_to_face:
-            hand_landmarks = self.create_mock_hand_landmarks(x=x, y=y, z=0.0)
+            hand_landmarks = create_mock_hand_landmarks(x=x, y=y, z=0.0)
             self.monitor.detect_eye_rubbing(face_landmarks, hand_landmarks, 640, 480)
         
         # Now hand is static on face for several frames
         result = False
+        hand_landmarks = create_mock_hand_landmarks(x=0.30, y=0.30, z=0.0)
         for i in range(10):
-            hand_landmarks = self.create_mock_hand_landmarks(x=0.30, y=0.30, z=0.0)
             result = self.monitor.detect_eye_rubbing(face_landmarks, hand_landmarks, 640, 480)
         
         # Should NOT detect because hand stopped moving
@@ -221,7 +240,7 @@ class TestMotionDetection(unittest.TestCase):
     
     def test_actual_rubbing_scenario(self):
         """Test: Realistic scenario - actual eye rubbing with continuous motion"""
-        face_landmarks = self.create_mock_face_landmarks(eye_z_depth=0.0)
+        face_landmarks = self.face_landmarks
         
         # Simulate actual rubbing - continuous back and forth motion near eye
         rubbing_motion = [
@@ -237,7 +256,7 @@ class TestMotionDetection(unittest.TestCase):
         
         detection_count = 0
         for x, y in rubbing_motion:
-            hand_landmarks = self.create_mock_hand_landmarks(x=x, y=y, z=0.0)
+            hand_landmarks = create_mock_hand_landmarks(x=x, y=y, z=0.0)
             result = self.monitor.detect_eye_rubbing(face_landmarks, hand_landmarks, 640, 480)
             if result:
                 detection_count += 1
@@ -247,18 +266,18 @@ class TestMotionDetection(unittest.TestCase):
     
     def test_history_cleared_when_hand_leaves_eye(self):
         """Test: Position history should be cleared when hand moves away from eye"""
-        face_landmarks = self.create_mock_face_landmarks(eye_z_depth=0.0)
+        face_landmarks = self.face_landmarks
         
         # Build up some history near eye
         for i in range(5):
-            hand_landmarks = self.create_mock_hand_landmarks(x=0.30 + i*0.01, y=0.30, z=0.0)
+            hand_landmarks = create_mock_hand_landmarks(x=0.30 + i*0.01, y=0.30, z=0.0)
             self.monitor.detect_eye_rubbing(face_landmarks, hand_landmarks, 640, 480)
         
         # Verify history has items
         self.assertGreater(len(self.monitor.hand_position_history), 0)
         
         # Move hand far from eye
-        hand_landmarks = self.create_mock_hand_landmarks(x=0.80, y=0.80, z=0.0)
+        hand_landmarks = create_mock_hand_landmarks(x=0.80, y=0.80, z=0.0)
         self.monitor.detect_eye_rubbing(face_landmarks, hand_landmarks, 640, 480)
         
         # History should be cleared
@@ -269,11 +288,11 @@ class TestMotionDetection(unittest.TestCase):
     
     def test_history_cleared_when_no_hand_detected(self):
         """Test: Position history should be cleared when hand is not detected"""
-        face_landmarks = self.create_mock_face_landmarks(eye_z_depth=0.0)
+        face_landmarks = self.face_landmarks
         
         # Build up some history
         for i in range(5):
-            hand_landmarks = self.create_mock_hand_landmarks(x=0.30 + i*0.01, y=0.30, z=0.0)
+            hand_landmarks = create_mock_hand_landmarks(x=0.30 + i*0.01, y=0.30, z=0.0)
             self.monitor.detect_eye_rubbing(face_landmarks, hand_landmarks, 640, 480)
         
         # Verify history has items